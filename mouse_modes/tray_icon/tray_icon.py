@@ -2,17 +2,25 @@
 # -*- coding: utf-8 -*-
 
 import os
+import re
+import copy
 import sys
-import json
-import subprocess
 import fcntl
+from pathlib import Path
+
+# Pick the Qt platform plugin before any Qt module is imported (fix for
+# QSocketNotifier issue) and skip debug-category logging
+os.environ.setdefault("QT_QPA_PLATFORM", "xcb")
+os.environ.setdefault("QT_LOGGING_RULES", "*.debug=false")
+
 from PyQt5.QtWidgets import (QApplication, QSystemTrayIcon, QMenu, QAction,
                              QDialog, QVBoxLayout, QHBoxLayout, QLabel,
-                             QLineEdit, QPushButton, QColorDialog, QTabWidget,
-                             QWidget, QListWidget, QListWidgetItem, QComboBox, QMessageBox,
-                             QFileDialog, QGridLayout, QGroupBox)
-from PyQt5.QtGui import QIcon, QPixmap, QColor, QPainter, QBrush
-from PyQt5.QtCore import Qt, QTimer, QSize, pyqtSignal
+                             QLineEdit, QPushButton, QTabWidget,
+                             QWidget, QListWidget, QListWidgetItem, QComboBox,
+                             QGridLayout, QGroupBox)
+from PyQt5.QtGui import QIcon, QPixmap, QPixmapCache, QColor, QPainter, QBrush
+from PyQt5.QtCore import (Qt, QTimer, QSize, QRectF, QFileSystemWatcher, QRunnable,
+                          QThreadPool, QMutex, pyqtSignal)
 
 # Singleton instance lock (prevents multiple tray icons)
 LOCK_FILE = '/tmp/mouse_modes_tray.lock'
@@ -31,6 +39,17 @@ ICON_DIR = os.path.join(CONFIG_DIR, "icons")
 PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 MODE_FILE = "/tmp/mouse_mode_current"
 
+# Matches the MODES=(...) array line in mode_manager.sh
+MODES_LINE_RE = re.compile(r'^[ \t]*MODES=\(.*$', re.M)
+
+# Old 'lower_middle' button names and their 'lower_right' replacements
+LOWER_MIDDLE_RENAMES = {"lower_middle": "lower_right", "Lower Middle": "Lower Right"}
+LOWER_MIDDLE_RE = re.compile("|".join(map(re.escape, LOWER_MIDDLE_RENAMES)))
+
+# Same renames for raw script bytes, skipping the text codec
+LOWER_MIDDLE_BYTE_RENAMES = {k.encode(): v.encode() for k, v in LOWER_MIDDLE_RENAMES.items()}
+LOWER_MIDDLE_BYTE_RE = re.compile(b"|".join(map(re.escape, LOWER_MIDDLE_BYTE_RENAMES)))
+
 # Ensure config directory exists
 os.makedirs(CONFIG_DIR, exist_ok=True)
 os.makedirs(ICON_DIR, exist_ok=True)
@@ -67,12 +86,20 @@ DEFAULT_CONFIG = {
         }
     }
 }
+# Parsed config, reused until the file's mtime changes
+_config_cache = {"mtime": 0, "data": None}
+
 def load_config():
     """Load configuration from file or create default if it doesn't exist"""
+    import json
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, 'r') as f:
-                config = json.load(f)
+            mtime = os.stat(CONFIG_FILE).st_mtime_ns
+            if _config_cache["data"] is not None and _config_cache["mtime"] == mtime:
+                return _config_cache["data"]
+            config = json.loads(Path(CONFIG_FILE).read_bytes())
+            _config_cache["mtime"] = mtime
+            _config_cache["data"] = config
             return config
         except Exception as e:
             print(f"Error loading config: {e}")
@@ -81,25 +108,153 @@ def load_config():
         save_config(DEFAULT_CONFIG)
         return DEFAULT_CONFIG
 
+# Serializes config writes, which may come from the GUI or a worker thread
+_save_lock = QMutex()
+
 def save_config(config):
     """Save configuration to file"""
+    import json
+    _save_lock.lock()
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config, f, indent=4)
+        # Write to a temp file and rename so a crash never leaves a torn config
+        tmp_file = CONFIG_FILE + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(config, f, indent=2)
+        os.replace(tmp_file, CONFIG_FILE)
+        
+        # Remember our own write so the next load doesn't re-parse it. A
+        # single update keeps the cache consistent when saving off-thread.
+        _config_cache.update(mtime=os.stat(CONFIG_FILE).st_mtime_ns, data=config)
     except Exception as e:
         print(f"Error saving config: {e}")
+    finally:
+        _save_lock.unlock()
+
+# Debounced config writes from the configuration dialog
+SAVE_DELAY_MS = 250
+_save_timer = None
+_pending_config = None
+
+def schedule_save(config):
+    """Save configuration after a short delay, coalescing rapid edits"""
+    global _save_timer, _pending_config
+    _pending_config = config
+    if _save_timer is None:
+        # Created lazily since a QTimer needs the QApplication to exist
+        _save_timer = QTimer()
+        _save_timer.setSingleShot(True)
+        _save_timer.setInterval(SAVE_DELAY_MS)
+        _save_timer.timeout.connect(flush_pending_save)
+    _save_timer.start()
+
+def flush_pending_save():
+    """Immediately write a configuration queued by schedule_save"""
+    global _pending_config
+    if _save_timer is not None:
+        _save_timer.stop()
+    if _pending_config is not None:
+        config = _pending_config
+        _pending_config = None
+        save_config(config)
+
+class _SaveConfigTask(QRunnable):
+    """Background task that saves a snapshot of the configuration"""
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+    
+    def run(self):
+        """Write the configuration snapshot"""
+        save_config(self.config)
+
+# Single-threaded pool so background saves run one at a time, in order
+_save_pool = None
+
+def save_config_in_background(config):
+    """Save a copy of the configuration without blocking the GUI thread"""
+    global _save_pool
+    if _save_pool is None:
+        _save_pool = QThreadPool()
+        _save_pool.setMaxThreadCount(1)
+    _save_pool.start(_SaveConfigTask(copy.deepcopy(config)))
+
+def wait_for_background_saves():
+    """Block until every queued background save has been written"""
+    if _save_pool is not None:
+        _save_pool.waitForDone()
+
+def rename_lower_middle(text):
+    """Replace old 'lower_middle' button names in a single pass"""
+    return LOWER_MIDDLE_RE.sub(lambda m: LOWER_MIDDLE_RENAMES[m.group(0)], text)
+
+def rename_lower_middle_script(old_script, new_script):
+    """Rewrite a lower_middle script in place and rename it to lower_right"""
+    path = Path(old_script)
+    data = path.read_bytes()
+    renamed = LOWER_MIDDLE_BYTE_RE.sub(lambda m: LOWER_MIDDLE_BYTE_RENAMES[m.group(0)], data)
+    if renamed != data:
+        path.write_bytes(renamed)
+    
+    # Make the file executable and move it to its new name
+    os.chmod(old_script, 0o755)
+    os.rename(old_script, new_script)
+
+# How long the tray waits to coalesce notifications
+NOTIFY_DELAY_MS = 150
+
+def _fire_and_forget(cmd):
+    """Start a command detached from the tray without waiting for it"""
+    import subprocess
+    try:
+        subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True, close_fds=True)
+    except OSError as e:
+        print(f"Error sending notification: {e}")
+
+# Last mode index read from the mode file, reused until its mtime changes
+_mode_file_cache = {"mtime": -1, "index": 0}
 
 def get_current_mode_index():
     """Get current mode index from mode file"""
     try:
         if os.path.exists(MODE_FILE):
+            mtime = os.stat(MODE_FILE).st_mtime_ns
+            if mtime == _mode_file_cache["mtime"]:
+                return _mode_file_cache["index"]
             with open(MODE_FILE, 'r') as f:
-                return int(f.read().strip())
+                index = int(f.read().strip())
+            _mode_file_cache.update(mtime=mtime, index=index)
+            return index
         return 0
     except Exception as e:
         print(f"Error reading mode file: {e}")
         return 0
 
+def write_mode_index(index):
+    """Write the current mode index to the mode file atomically"""
+    import tempfile
+    # Use a fresh, exclusively created temp file since /tmp is world-writable
+    mode_dir, mode_name = os.path.split(MODE_FILE)
+    fd, tmp_file = tempfile.mkstemp(prefix=f".{mode_name}.", dir=mode_dir)
+    try:
+        try:
+            os.fchmod(fd, 0o644)
+            os.write(fd, str(index).encode())
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, MODE_FILE)
+    except BaseException:
+        # Don't leave the temp file behind if the write or rename failed
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+        raise
+    
+    # Remember our own write so the next read doesn't reopen the file
+    _mode_file_cache.update(mtime=os.stat(MODE_FILE).st_mtime_ns, index=index)
+
 def get_current_mode_name(config):
     """Get current mode name based on index"""
     index = get_current_mode_index()
@@ -108,59 +263,137 @@ def get_current_mode_name(config):
         return modes[index]
     return "default"
 
-def switch_to_next_mode():
-    """Switch to the next mode by calling the volume up script"""
-    script_path = os.path.join(PROJECT_DIR, "button_volume_up.sh")
-    subprocess.run([script_path])
+def switch_to_next_mode(config):
+    """Switch to the next mode by advancing the mode file directly
+    
+    Returns the name of the new mode.
+    """
+    modes = list(config["modes"].keys())
+    index = (get_current_mode_index() + 1) % len(modes)
+    write_mode_index(index)
+    return modes[index]
 
-def create_mouse_icon(color_hex):
-    """Create a mouse icon with the specified color"""
-    size = 64
-    pixmap = QPixmap(size, size)
-    pixmap.fill(Qt.transparent)
+# Mode-specific mouse buttons, in display order
+BUTTON_NAMES = ("upper_left", "lower_left", "upper_right", "lower_right")
+
+# Mouse icon size in pixels
+MOUSE_ICON_SIZE = 64
+
+# Size of the shared QPixmapCache used for icons and swatches
+PIXMAP_CACHE_LIMIT_KB = 4096
+
+def get_icon_path(color_hex):
+    """Get the path of the saved icon PNG for a color"""
+    return os.path.join(ICON_DIR, f"mouse_icon_{color_hex.replace('#', '')}.png")
+
+def get_mouse_pixmap(color_hex):
+    """Get the mouse icon pixmap for a color, shared through QPixmapCache"""
+    key = f"mouse:{color_hex}"
+    pixmap = QPixmapCache.find(key)
+    if pixmap is not None and not pixmap.isNull():
+        return pixmap
     
-    painter = QPainter(pixmap)
-    painter.setRenderHint(QPainter.Antialiasing)
-    
-    # Set the color for all circles
-    color = QColor(color_hex)
-    painter.setBrush(QBrush(color))
-    painter.setPen(Qt.NoPen)
-    
-    # Draw the face (larger circle) - positioned lower in the icon and slightly smaller
-    face_size = int(size * 0.63)  # Reduced from 0.65 to 0.63
-    face_x = int((size - face_size) / 2)
-    face_y = int((size - face_size) / 2) + int(size * 0.05)  # Moved down by 5% of icon size
-    painter.drawEllipse(face_x, face_y, face_size, face_size)
-    
-    # Draw the ears (slightly smaller than before, but still bigger than original)
-    ear_size = int(size * 0.32)  # Reduced from 0.35 to 0.32
-    ear_offset = int(size * 0.05)  # Small offset to disconnect from face
-    
-    # Left ear - adjusted position to account for face position
-    painter.drawEllipse(
-        int(face_x - ear_size/2 - ear_offset),
-        int(face_y - ear_size/2),
-        ear_size,
-        ear_size
-    )
-    
-    # Right ear - adjusted position to account for face position
-    painter.drawEllipse(
-        int(face_x + face_size - ear_size/2 + ear_offset),
-        int(face_y - ear_size/2),
-        ear_size,
-        ear_size
-    )
+    # Reuse the icon saved by a previous run if there is one
+    pixmap = QPixmap(get_icon_path(color_hex))
+    if pixmap.isNull():
+        pixmap = _paint_mouse_pixmap(color_hex)
+    
+    QPixmapCache.insert(key, pixmap)
+    return pixmap
+
+def _mouse_shape_rects(size):
+    """Get the face and ear ellipses of the mouse icon for a given size"""
+    # Face (larger circle) - positioned lower in the icon and slightly smaller
+    face_size = size * 0.63  # Reduced from 0.65 to 0.63
+    face_x = (size - face_size) / 2
+    face_y = (size - face_size) / 2 + size * 0.05  # Moved down by 5% of icon size
+    
+    # Ears (slightly smaller than before, but still bigger than original)
+    ear_size = size * 0.32  # Reduced from 0.35 to 0.32
+    ear_offset = size * 0.05  # Small offset to disconnect from face
+    ear_y = face_y - ear_size / 2
+    
+    return [
+        QRectF(face_x, face_y, face_size, face_size),
+        # Left ear - adjusted position to account for face position
+        QRectF(face_x - ear_size / 2 - ear_offset, ear_y, ear_size, ear_size),
+        # Right ear - adjusted position to account for face position
+        QRectF(face_x + face_size - ear_size / 2 + ear_offset, ear_y, ear_size, ear_size),
+    ]
+
+MOUSE_SHAPE_RECTS = _mouse_shape_rects(MOUSE_ICON_SIZE)
+
+# Antialiased mouse silhouette, painted once and recolored per mode
+_mouse_template = None
+
+def _get_mouse_template():
+    """Get the monochrome mouse silhouette, painting it on first use"""
+    global _mouse_template
+    if _mouse_template is None:
+        template = QPixmap(MOUSE_ICON_SIZE, MOUSE_ICON_SIZE)
+        template.fill(Qt.transparent)
+        
+        painter = QPainter(template)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setBrush(QBrush(Qt.black))
+        painter.setPen(Qt.NoPen)
+        for rect in MOUSE_SHAPE_RECTS:
+            painter.drawEllipse(rect)
+        painter.end()
+        
+        _mouse_template = template
+    return _mouse_template
+
+def _paint_mouse_pixmap(color_hex):
+    """Paint the mouse icon for a color by recoloring the silhouette"""
+    pixmap = QPixmap(_get_mouse_template())
     
+    # Fill only where the silhouette is opaque, keeping its antialiased edges
+    painter = QPainter(pixmap)
+    painter.setCompositionMode(QPainter.CompositionMode_SourceIn)
+    painter.fillRect(pixmap.rect(), QColor(color_hex))
     painter.end()
     
-    # Save the icon for future use
-    icon_path = os.path.join(ICON_DIR, f"mouse_icon_{color_hex.replace('#', '')}.png")
-    pixmap.save(icon_path)
+    return pixmap
+
+def create_mouse_icon(color_hex):
+    """Create a mouse icon with the specified color
+    
+    Used by the tray icon; previews paint from get_mouse_pixmap directly
+    so they never write to disk.
+    """
+    icon_path = get_icon_path(color_hex)
+    pixmap = get_mouse_pixmap(color_hex)
+    
+    # Save the icon for future use (only if not already on disk)
+    if not os.path.isfile(icon_path):
+        pixmap.save(icon_path, "PNG")
     
     return pixmap
 
+# Basic colors offered by the color dialog
+BASIC_COLORS = [
+    "#3498db",  # Blue
+    "#e74c3c",  # Red
+    "#2ecc71",  # Green
+    "#f39c12",  # Orange
+    "#9b59b6",  # Purple
+    "#1abc9c",  # Turquoise
+    "#34495e",  # Dark Blue
+    "#f1c40f",  # Yellow
+    "#e67e22",  # Dark Orange
+    "#95a5a6",  # Gray
+    "#16a085",  # Dark Turquoise
+    "#d35400",  # Dark Orange
+    "#c0392b",  # Dark Red
+    "#8e44ad",  # Dark Purple
+    "#27ae60",  # Dark Green
+    "#7f8c8d"   # Dark Gray
+]
+
+# Style sheets for the basic color buttons, built once
+BASIC_COLOR_STYLES = {c: f"background-color: {c}; border: 1px solid #888;" for c in BASIC_COLORS}
+
 class MouseIconPreview(QWidget):
     """Widget to preview the mouse icon with a selected color"""
     def __init__(self, color_hex="#3498db", parent=None):
@@ -168,18 +401,35 @@ class MouseIconPreview(QWidget):
         self.color_hex = color_hex
         self.setMinimumSize(100, 100)
         
+        # Scaled pixmap reused across paint events
+        self._scaled = None
+        self._scaled_size = -1
+        
     def set_color(self, color_hex):
         """Update the preview with a new color"""
         self.color_hex = color_hex
+        self._scaled = None
         self.update()
         
+    def resizeEvent(self, event):
+        """Drop the scaled pixmap so it is rebuilt at the new size"""
+        self._scaled = None
+        super().resizeEvent(event)
+        
     def paintEvent(self, event):
         """Paint the mouse icon preview"""
         size = min(self.width(), self.height())
-        pixmap = create_mouse_icon(self.color_hex)
         
-        # Scale the pixmap to fit the widget
-        scaled_pixmap = pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        # Scale the pixmap to fit the widget (only when color or size changed)
+        if self._scaled is None or self._scaled_size != size:
+            pixmap = get_mouse_pixmap(self.color_hex)
+            if size == pixmap.width():
+                transform = Qt.FastTransformation
+            else:
+                transform = Qt.SmoothTransformation
+            self._scaled = pixmap.scaled(size, size, Qt.KeepAspectRatio, transform)
+            self._scaled_size = size
+        scaled_pixmap = self._scaled
         
         # Center the pixmap in the widget
         x = (self.width() - scaled_pixmap.width()) // 2
@@ -217,30 +467,12 @@ class EnhancedColorDialog(QDialog):
         
         # Basic colors
         basic_colors_layout = QGridLayout()
-        basic_colors = [
-            "#3498db",  # Blue
-            "#e74c3c",  # Red
-            "#2ecc71",  # Green
-            "#f39c12",  # Orange
-            "#9b59b6",  # Purple
-            "#1abc9c",  # Turquoise
-            "#34495e",  # Dark Blue
-            "#f1c40f",  # Yellow
-            "#e67e22",  # Dark Orange
-            "#95a5a6",  # Gray
-            "#16a085",  # Dark Turquoise
-            "#d35400",  # Dark Orange
-            "#c0392b",  # Dark Red
-            "#8e44ad",  # Dark Purple
-            "#27ae60",  # Dark Green
-            "#7f8c8d"   # Dark Gray
-        ]
         
         row, col = 0, 0
-        for color_hex in basic_colors:
+        for color_hex in BASIC_COLORS:
             color_button = QPushButton()
             color_button.setFixedSize(40, 40)
-            color_button.setStyleSheet(f"background-color: {color_hex}; border: 1px solid #888;")
+            color_button.setStyleSheet(BASIC_COLOR_STYLES[color_hex])
             color_button.clicked.connect(lambda checked, c=color_hex: self.select_basic_color(c))
             basic_colors_layout.addWidget(color_button, row, col)
             col += 1
@@ -273,6 +505,11 @@ class EnhancedColorDialog(QDialog):
         self.setLayout(layout)
         self.selected_color = QColor(initial_color)
     
+    def reset(self, initial_color):
+        """Prepare the dialog to be shown again with a new initial color"""
+        self.selected_color = QColor(initial_color)
+        self.preview.set_color(initial_color)
+    
     def select_basic_color(self, color_hex):
         """Select a basic color"""
         color = QColor(color_hex)
@@ -281,6 +518,7 @@ class EnhancedColorDialog(QDialog):
     
     def open_color_dialog(self):
         """Open the standard color dialog for custom colors"""
+        from PyQt5.QtWidgets import QColorDialog
         color = QColorDialog.getColor(self.selected_color, self)
         if color.isValid():
             self.selected_color = color
@@ -363,37 +601,17 @@ class EditScriptsDialog(QDialog):
         # Create a grid layout for the buttons
         grid_layout = QGridLayout()
         
-        # Upper Left Button
-        grid_layout.addWidget(QLabel("Upper Left Button:"), 0, 0)
-        self.upper_left_edit = QLineEdit(config["modes"][mode_name]["buttons"]["upper_left"])
-        self.upper_left_browse = QPushButton("Browse")
-        self.upper_left_browse.clicked.connect(lambda: self.browse_script("upper_left"))
-        grid_layout.addWidget(self.upper_left_edit, 0, 1)
-        grid_layout.addWidget(self.upper_left_browse, 0, 2)
-        
-        # Lower Left Button
-        grid_layout.addWidget(QLabel("Lower Left Button:"), 1, 0)
-        self.lower_left_edit = QLineEdit(config["modes"][mode_name]["buttons"]["lower_left"])
-        self.lower_left_browse = QPushButton("Browse")
-        self.lower_left_browse.clicked.connect(lambda: self.browse_script("lower_left"))
-        grid_layout.addWidget(self.lower_left_edit, 1, 1)
-        grid_layout.addWidget(self.lower_left_browse, 1, 2)
-        
-        # Upper Right Button
-        grid_layout.addWidget(QLabel("Upper Right Button:"), 2, 0)
-        self.upper_right_edit = QLineEdit(config["modes"][mode_name]["buttons"]["upper_right"])
-        self.upper_right_browse = QPushButton("Browse")
-        self.upper_right_browse.clicked.connect(lambda: self.browse_script("upper_right"))
-        grid_layout.addWidget(self.upper_right_edit, 2, 1)
-        grid_layout.addWidget(self.upper_right_browse, 2, 2)
-        
-        # Lower Right Button
-        grid_layout.addWidget(QLabel("Lower Right Button:"), 3, 0)
-        self.lower_right_edit = QLineEdit(config["modes"][mode_name]["buttons"]["lower_right"])
-        self.lower_right_browse = QPushButton("Browse")
-        self.lower_right_browse.clicked.connect(lambda: self.browse_script("lower_right"))
-        grid_layout.addWidget(self.lower_right_edit, 3, 1)
-        grid_layout.addWidget(self.lower_right_browse, 3, 2)
+        # One row per button: label, script path and browse button
+        self._edits = {}
+        for row, button_name in enumerate(BUTTON_NAMES):
+            label = QLabel(f"{button_name.replace('_', ' ').title()} Button:")
+            edit = QLineEdit(config["modes"][mode_name]["buttons"][button_name])
+            browse = QPushButton("Browse")
+            browse.clicked.connect(lambda checked, b=button_name: self.browse_script(b))
+            grid_layout.addWidget(label, row, 0)
+            grid_layout.addWidget(edit, row, 1)
+            grid_layout.addWidget(browse, row, 2)
+            self._edits[button_name] = edit
         
         layout.addLayout(grid_layout)
         
@@ -411,34 +629,24 @@ class EditScriptsDialog(QDialog):
     
     def browse_script(self, button_name):
         """Open file dialog to browse for a script"""
+        from PyQt5.QtWidgets import QFileDialog
         file_path, _ = QFileDialog.getOpenFileName(
             self, f"Select Script for {button_name}", 
             os.path.join(PROJECT_DIR, "mouse_modes"), 
             "Shell Scripts (*.sh);;All Files (*)"
         )
         if file_path:
-            if button_name == "upper_left":
-                self.upper_left_edit.setText(file_path)
-            elif button_name == "lower_left":
-                self.lower_left_edit.setText(file_path)
-            elif button_name == "upper_right":
-                self.upper_right_edit.setText(file_path)
-            elif button_name == "lower_right":
-                self.lower_right_edit.setText(file_path)
+            self._edits[button_name].setText(file_path)
     
     def get_scripts(self):
         """Get the scripts entered by the user"""
-        return {
-            "upper_left": self.upper_left_edit.text(),
-            "lower_left": self.lower_left_edit.text(),
-            "upper_right": self.upper_right_edit.text(),
-            "lower_right": self.lower_right_edit.text()
-        }
+        return {button_name: edit.text() for button_name, edit in self._edits.items()}
 class ConfigDialog(QDialog):
     """Main configuration dialog"""
     def __init__(self, config, parent=None):
         super().__init__(parent)
         self.config = config
+        self._mode_items = {}
         self.setWindowTitle("Mouse Modes Configuration")
         self.setMinimumSize(600, 400)
         
@@ -468,12 +676,23 @@ class ConfigDialog(QDialog):
         
         self.setLayout(layout)
     
+    def reset(self, config):
+        """Prepare the dialog to be shown again with the given configuration"""
+        self.config = config
+        self.update_mode_list()
+    
+    def done(self, result):
+        """Write any pending config changes before the dialog closes"""
+        flush_pending_save()
+        super().done(result)
+    
     def setup_modes_tab(self):
         """Setup the modes tab"""
         layout = QVBoxLayout()
         
         # Mode list
         self.mode_list = QListWidget()
+        self.mode_list.setIconSize(QSize(20, 20))
         self.update_mode_list()
         layout.addWidget(self.mode_list)
         
@@ -530,42 +749,52 @@ class ConfigDialog(QDialog):
         
         self.settings_tab.setLayout(layout)
     
+    def get_swatch(self, color_hex):
+        """Get the 20x20 color square for a mode color, shared through QPixmapCache"""
+        key = f"swatch:{color_hex}"
+        swatch = QPixmapCache.find(key)
+        if swatch is None or swatch.isNull():
+            swatch = QPixmap(20, 20)
+            swatch.fill(QColor(color_hex))
+            
+            # Keep antialiasing off: a square this small has no curves to smooth
+            painter = QPainter(swatch)
+            painter.setRenderHint(QPainter.Antialiasing, False)
+            painter.setPen(QColor("#888"))
+            painter.drawRect(0, 0, 19, 19)
+            painter.end()
+            QPixmapCache.insert(key, swatch)
+        return swatch
+    
     def update_mode_list(self):
-        """Update the mode list widget"""
-        self.mode_list.clear()
-        for mode_name, mode_data in self.config["modes"].items():
+        """Update the mode list widget, only touching rows that changed"""
+        modes = self.config["modes"]
+        
+        # Remove rows for modes that no longer exist
+        for mode_name in list(self._mode_items):
+            if mode_name not in modes:
+                list_item, _ = self._mode_items.pop(mode_name)
+                self.mode_list.takeItem(self.mode_list.row(list_item))
+        
+        for mode_name, mode_data in modes.items():
             color = mode_data.get("color", "#3498db")
             
-            # Create a widget for the list item
-            item_widget = QWidget()
-            item_layout = QHBoxLayout()
-            item_layout.setContentsMargins(4, 2, 4, 2)
-            
-            # Mode name label
-            name_label = QLabel(mode_name)
-            item_layout.addWidget(name_label)
-            
-            # Spacer
-            item_layout.addStretch()
-            
-            # Color square
-            color_square = QLabel()
-            color_square.setFixedSize(20, 20)
-            color_square.setStyleSheet(f"background-color: {color}; border: 1px solid #888;")
-            item_layout.addWidget(color_square)
-            
-            item_widget.setLayout(item_layout)
-            
-            # Create list item and set the widget
-            list_item = QListWidgetItem()
-            list_item.setSizeHint(item_widget.sizeHint())
+            # Existing row: refresh the color square only if the color changed
+            if mode_name in self._mode_items:
+                list_item, shown_color = self._mode_items[mode_name]
+                if color != shown_color:
+                    list_item.setIcon(QIcon(self.get_swatch(color)))
+                    self._mode_items[mode_name] = (list_item, color)
+                continue
             
-            # Add to list
+            # New row: mode name with its color square as the item icon
+            list_item = QListWidgetItem(QIcon(self.get_swatch(color)), mode_name)
             self.mode_list.addItem(list_item)
-            self.mode_list.setItemWidget(list_item, item_widget)
+            self._mode_items[mode_name] = (list_item, color)
     
     def add_mode(self):
         """Add a new mode"""
+        from PyQt5.QtWidgets import QMessageBox
         dialog = AddModeDialog(self)
         if dialog.exec_():
             mode_info = dialog.get_mode_info()
@@ -584,8 +813,7 @@ class ConfigDialog(QDialog):
             os.makedirs(mode_dir, exist_ok=True)
             
             # Create button scripts
-            buttons = ["upper_left", "lower_left", "upper_right", "lower_right"]
-            for button in buttons:
+            for button in BUTTON_NAMES:
                 script_path = os.path.join(mode_dir, f"{button}.sh")
                 if not os.path.exists(script_path):
                     with open(script_path, 'w') as f:
@@ -609,37 +837,34 @@ notify-send "Mouse Button" "{button.replace('_', ' ').title()} Button Pressed in
                 }
             }
             
-            save_config(self.config)
+            schedule_save(self.config)
             self.update_mode_list()
     
     def edit_scripts(self):
         """Edit scripts for the selected mode"""
+        from PyQt5.QtWidgets import QMessageBox
         selected_items = self.mode_list.selectedItems()
         if not selected_items:
             QMessageBox.warning(self, "Error", "Please select a mode")
             return
         
-        # Get the selected item's widget
-        selected_item = selected_items[0]
-        item_widget = self.mode_list.itemWidget(selected_item)
-        
-        # Get the mode name from the first label in the widget
-        mode_name = item_widget.layout().itemAt(0).widget().text()
+        mode_name = selected_items[0].text()
         
         dialog = EditScriptsDialog(mode_name, self.config, self)
         if dialog.exec_():
             scripts = dialog.get_scripts()
             self.config["modes"][mode_name]["buttons"] = scripts
-            save_config(self.config)
+            schedule_save(self.config)
     
     def change_color(self):
         """Change color for the selected mode"""
+        from PyQt5.QtWidgets import QMessageBox
         selected_items = self.mode_list.selectedItems()
         if not selected_items:
             QMessageBox.warning(self, "Error", "Please select a mode")
             return
         
-        mode_name = selected_items[0].text().split(" (")[0]
+        mode_name = selected_items[0].text()
         current_color = self.config["modes"][mode_name].get("color", "#3498db")
         
         dialog = EnhancedColorDialog(current_color, self)
@@ -647,22 +872,18 @@ notify-send "Mouse Button" "{button.replace('_', ' ').title()} Button Pressed in
             color = dialog.get_selected_color()
             if color.isValid():
                 self.config["modes"][mode_name]["color"] = color.name()
-                save_config(self.config)
+                schedule_save(self.config)
                 self.update_mode_list()
     
     def remove_mode(self):
         """Remove the selected mode"""
+        from PyQt5.QtWidgets import QMessageBox
         selected_items = self.mode_list.selectedItems()
         if not selected_items:
             QMessageBox.warning(self, "Error", "Please select a mode")
             return
         
-        # Get the selected item's widget
-        selected_item = selected_items[0]
-        item_widget = self.mode_list.itemWidget(selected_item)
-        
-        # Get the mode name from the first label in the widget
-        mode_name = item_widget.layout().itemAt(0).widget().text()
+        mode_name = selected_items[0].text()
         
         # Don't allow removing default mode
         if mode_name == "default":
@@ -677,29 +898,28 @@ notify-send "Mouse Button" "{button.replace('_', ' ').title()} Button Pressed in
         
         if reply == QMessageBox.Yes:
             del self.config["modes"][mode_name]
-            save_config(self.config)
+            schedule_save(self.config)
             self.update_mode_list()
     
     def update_mode_manager(self):
         """Update the mode_manager.sh script with current modes"""
+        from PyQt5.QtWidgets import QMessageBox
         mode_names = list(self.config["modes"].keys())
         
         try:
             # Read the current mode_manager.sh
             mode_manager_path = os.path.join(PROJECT_DIR, "mouse_modes", "mode_manager.sh")
-            with open(mode_manager_path, 'r') as f:
-                content = f.readlines()
+            content = Path(mode_manager_path).read_text()
             
-            # Find the MODES line and replace it
-            for i, line in enumerate(content):
-                if line.strip().startswith("MODES=("):
-                    modes_str = '"' + '" "'.join(mode_names) + '"'
-                    content[i] = f"MODES=({modes_str})\n"
-                    break
+            # Replace the MODES line
+            modes_str = '"' + '" "'.join(mode_names) + '"'
+            content = MODES_LINE_RE.sub(lambda m: f"MODES=({modes_str})", content, count=1)
             
-            # Write the updated content
-            with open(mode_manager_path, 'w') as f:
-                f.writelines(content)
+            # Write the updated content atomically, keeping the script executable
+            tmp_path = mode_manager_path + ".tmp"
+            Path(tmp_path).write_text(content)
+            os.chmod(tmp_path, os.stat(mode_manager_path).st_mode)
+            os.replace(tmp_path, mode_manager_path)
             
             QMessageBox.information(self, "Success", "mode_manager.sh has been updated with current modes")
         except Exception as e:
@@ -707,54 +927,26 @@ notify-send "Mouse Button" "{button.replace('_', ' ').title()} Button Pressed in
     
     def rename_button_files(self):
         """Rename 'lower_middle' to 'lower_right' in all files"""
+        from PyQt5.QtWidgets import QMessageBox
         try:
             # Rename button script
             old_button_script = os.path.join(PROJECT_DIR, "button_lower_middle.sh")
             new_button_script = os.path.join(PROJECT_DIR, "button_lower_right.sh")
             
             if os.path.exists(old_button_script):
-                # Read the content
-                with open(old_button_script, 'r') as f:
-                    content = f.read()
-                
-                # Replace occurrences of "lower_middle" with "lower_right"
-                content = content.replace("lower_middle", "lower_right")
-                content = content.replace("Lower Middle", "Lower Right")
-                
-                # Write to the new file
-                with open(new_button_script, 'w') as f:
-                    f.write(content)
-                
-                # Make the new file executable
-                os.chmod(new_button_script, 0o755)
-                
-                # Remove the old file
-                os.remove(old_button_script)
+                rename_lower_middle_script(old_button_script, new_button_script)
             
-            # Rename mode script files
-            for mode_name in self.config["modes"]:
-                mode_dir = os.path.join(PROJECT_DIR, "mouse_modes", mode_name)
-                old_script = os.path.join(mode_dir, "lower_middle.sh")
-                new_script = os.path.join(mode_dir, "lower_right.sh")
-                
-                if os.path.exists(old_script):
-                    # Read the content
-                    with open(old_script, 'r') as f:
-                        content = f.read()
-                    
-                    # Replace occurrences of "lower_middle" with "lower_right"
-                    content = content.replace("lower_middle", "lower_right")
-                    content = content.replace("Lower Middle", "Lower Right")
-                    
-                    # Write to the new file
-                    with open(new_script, 'w') as f:
-                        f.write(content)
-                    
-                    # Make the new file executable
-                    os.chmod(new_script, 0o755)
-                    
-                    # Remove the old file
-                    os.remove(old_script)
+            # Rename mode script files, walking the mode directories once
+            mouse_modes_root = os.path.join(PROJECT_DIR, "mouse_modes")
+            with os.scandir(mouse_modes_root) as mode_dirs:
+                for mode_dir in mode_dirs:
+                    if not mode_dir.is_dir() or mode_dir.name not in self.config["modes"]:
+                        continue
+                    with os.scandir(mode_dir.path) as scripts:
+                        old_scripts = [e.path for e in scripts if e.name == "lower_middle.sh"]
+                    for old_script in old_scripts:
+                        new_script = os.path.join(mode_dir.path, "lower_right.sh")
+                        rename_lower_middle_script(old_script, new_script)
             
             # Update README.md
             readme_path = os.path.join(PROJECT_DIR, "mouse_modes", "README.md")
@@ -762,19 +954,18 @@ notify-send "Mouse Button" "{button.replace('_', ' ').title()} Button Pressed in
                 with open(readme_path, 'r') as f:
                     content = f.read()
                 
-                content = content.replace("lower_middle.sh", "lower_right.sh")
-                content = content.replace("Lower Middle", "Lower Right")
-                content = content.replace("lower_middle", "lower_right")
-                
-                with open(readme_path, 'w') as f:
-                    f.write(content)
+                # Only rewrite the README if it still mentions the old name
+                if LOWER_MIDDLE_RE.search(content):
+                    content = rename_lower_middle(content)
+                    with open(readme_path, 'w') as f:
+                        f.write(content)
             
             # Update config
             for mode_name, mode_data in self.config["modes"].items():
                 if "buttons" in mode_data and "lower_middle" in mode_data["buttons"]:
                     mode_data["buttons"]["lower_right"] = mode_data["buttons"].pop("lower_middle")
             
-            save_config(self.config)
+            schedule_save(self.config)
             
             QMessageBox.information(self, "Success", "Successfully renamed 'lower_middle' to 'lower_right' in all files")
         except Exception as e:
@@ -784,89 +975,249 @@ class MouseModesTray:
     def __init__(self):
         self.app = QApplication(sys.argv)
         self.app.setQuitOnLastWindowClosed(False)
+        self.app.aboutToQuit.connect(flush_pending_save)
+        self.app.aboutToQuit.connect(wait_for_background_saves)
+        
+        # Process-wide cache for icons and swatches (in KB)
+        QPixmapCache.setCacheLimit(PIXMAP_CACHE_LIMIT_KB)
         
         # Load configuration
         self.config = load_config()
         
+        # Notifications are batched so rapid switching spawns one notify-send
+        self._pending_notify = []
+        self._notify_timer = QTimer()
+        self._notify_timer.setSingleShot(True)
+        self._notify_timer.setInterval(NOTIFY_DELAY_MS)
+        self._notify_timer.timeout.connect(self.send_notifications)
+        
+        # Dialogs are created on first use and then reused
+        self._color_dialog = None
+        self._config_dialog = None
+        
+        # Tray icons by color, plus what update_icon last showed
+        self._icon_cache = {}
+        self._last_mode = None
+        self._last_color = None
+        self._last_tooltip = None
+        
+        # Button assignment part of the tooltip, built per mode on config changes
+        self._tooltip_by_mode = {}
+        self.rebuild_tooltip_cache()
+        
         # Create the tray icon
         self.tray_icon = QSystemTrayIcon()
         self.tray_icon.setToolTip("Mouse Modes")
         
         # Create the menu
+        self.build_menu()
+        
+        # Set the menu
+        self.tray_icon.setContextMenu(self.menu)
+        
+        # Watch the mode and config files instead of polling them
+        if not os.path.exists(MODE_FILE):
+            Path(MODE_FILE).write_text("0")  # Start with default mode (index 0)
+        self.watcher = QFileSystemWatcher()
+        self.watcher.fileChanged.connect(self.file_changed)
+        self.watcher.directoryChanged.connect(self.directory_changed)
+        self.watch_files()
+        
+        # Update the icon based on current mode
+        self.update_icon()
+        
+        # Show the tray icon
+        self.tray_icon.show()
+        
+        # Connect the activated signal
+        self.tray_icon.activated.connect(self.tray_activated)
+    
+    def build_menu(self):
+        """Create the tray menu with the mode actions and the fixed actions"""
         self.menu = QMenu()
         
-        # Add mode switching actions
+        # Mode switching actions, all handled by one slot on the menu
         self.mode_actions = {}
-        for mode_name in self.config["modes"]:
-            action = QAction(f"Switch to {mode_name} mode", self.menu)
-            action.triggered.connect(lambda checked, m=mode_name: self.switch_to_mode(m))
-            self.menu.addAction(action)
-            self.mode_actions[mode_name] = action
+        self.menu.triggered.connect(self.mode_action_triggered)
         
-        self.menu.addSeparator()
+        # Mode actions are kept above this separator
+        self._sep = self.menu.addSeparator()
         
         # Change color action for current mode
-        change_color_action = QAction("Change Current Mode Color...", self.menu)
-        change_color_action.triggered.connect(self.change_current_mode_color)
-        self.menu.addAction(change_color_action)
+        self._change_color_action = QAction("Change Current Mode Color...", self.menu)
+        self._change_color_action.triggered.connect(self.change_current_mode_color)
+        self.menu.addAction(self._change_color_action)
         
         # Configure action
-        configure_action = QAction("Configure...", self.menu)
-        configure_action.triggered.connect(self.open_config_dialog)
-        self.menu.addAction(configure_action)
+        self._configure_action = QAction("Configure...", self.menu)
+        self._configure_action.triggered.connect(self.open_config_dialog)
+        self.menu.addAction(self._configure_action)
         
         # Quit action
-        quit_action = QAction("Quit", self.menu)
-        quit_action.triggered.connect(self.app.quit)
-        self.menu.addAction(quit_action)
+        self._quit_action = QAction("Quit", self.menu)
+        self._quit_action.triggered.connect(self.app.quit)
+        self.menu.addAction(self._quit_action)
         
-        # Set the menu
-        self.tray_icon.setContextMenu(self.menu)
-        
-        # Update the icon based on current mode
-        self.update_icon()
+        self.sync_menu()
+    
+    def sync_menu(self):
+        """Add and remove mode actions so the menu matches the config"""
+        modes = self.config["modes"]
+        changed = False
+        
+        for mode_name in list(self.mode_actions):
+            if mode_name not in modes:
+                action = self.mode_actions.pop(mode_name)
+                self.menu.removeAction(action)
+                action.deleteLater()
+                changed = True
+        
+        for mode_name in modes:
+            if mode_name not in self.mode_actions:
+                action = self.create_mode_action(mode_name)
+                self.menu.insertAction(self._sep, action)
+                self.mode_actions[mode_name] = action
+                changed = True
         
-        # Set up a timer to periodically check the current mode
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_icon)
-        self.timer.start(1000)  # Check every second
+        # Make sure the next update_icon sets the new actions' check state
+        if changed:
+            self._last_mode = None
+    
+    def create_mode_action(self, mode_name):
+        """Create the menu action that switches to a mode"""
+        action = QAction(f"Switch to {mode_name} mode", self.menu)
+        action.setCheckable(True)
+        action.setData(mode_name)
+        return action
+    
+    def mode_action_triggered(self, action):
+        """Switch to the mode of a triggered mode action"""
+        mode_name = action.data()
+        if mode_name is not None:
+            # Qt toggled the action on click, so resync every check state
+            self._last_mode = None
+            self.switch_to_mode(mode_name)
+    
+    def update_icon(self, current_mode=None):
+        """Update the tray icon based on the current mode
         
-        # Show the tray icon
-        self.tray_icon.show()
+        Pass current_mode when it is already known to skip reading the mode file.
+        """
+        self.watch_files()
         
-        # Connect the activated signal
-        self.tray_icon.activated.connect(self.tray_activated)
-    
-    def update_icon(self):
-        """Update the tray icon based on the current mode"""
-        current_mode = get_current_mode_name(self.config)
+        if current_mode is None:
+            current_mode = get_current_mode_name(self.config)
         color = self.config["modes"][current_mode].get("color", "#3498db")
         
-        # Create the icon
-        pixmap = create_mouse_icon(color)
-        icon = QIcon(pixmap)
+        if current_mode not in self._tooltip_by_mode:
+            self.rebuild_tooltip_cache()
+        tooltip = f"Mouse Modes - Current: {current_mode}\n\n{self._tooltip_by_mode[current_mode]}"
         
-        # Set the icon
-        self.tray_icon.setIcon(icon)
-        
-        # Update tooltip
-        tooltip = f"Mouse Modes - Current: {current_mode}\n\n"
-        tooltip += "Button Assignments:\n"
+        # Nothing to do if the mode, its color and the tooltip are unchanged
+        if (current_mode == self._last_mode and color == self._last_color
+                and tooltip == self._last_tooltip):
+            return
         
-        for button, script in self.config["modes"][current_mode]["buttons"].items():
-            script_name = os.path.basename(script)
-            tooltip += f"{button.replace('_', ' ').title()}: {script_name}\n"
+        # Set the icon, creating it only the first time a color is used
+        if color != self._last_color:
+            icon = self._icon_cache.get(color)
+            if icon is None:
+                icon = QIcon(create_mouse_icon(color))
+                self._icon_cache[color] = icon
+            self.tray_icon.setIcon(icon)
+            self._last_color = color
         
-        self.tray_icon.setToolTip(tooltip)
+        # Update tooltip
+        if tooltip != self._last_tooltip:
+            self.tray_icon.setToolTip(tooltip)
+            self._last_tooltip = tooltip
         
         # Update menu
         for mode_name, action in self.mode_actions.items():
-            action.setChecked(mode_name == current_mode)
+            checked = mode_name == current_mode
+            if action.isChecked() != checked:
+                action.setChecked(checked)
+        self._last_mode = current_mode
+    
+    def rebuild_tooltip_cache(self):
+        """Rebuild the button assignment tooltip text for every mode"""
+        self._tooltip_by_mode = {}
+        for mode_name, mode_data in self.config["modes"].items():
+            lines = [f"{button.replace('_', ' ').title()}: {os.path.basename(script)}"
+                     for button, script in mode_data.get("buttons", {}).items()]
+            self._tooltip_by_mode[mode_name] = "Button Assignments:\n" + "\n".join(lines)
+    
+    def watch_files(self):
+        """Re-add watched files that were dropped after being replaced
+        
+        The parent directories are watched too so a file that was deleted is
+        picked up again once it is recreated.
+        """
+        watched = self.watcher.files()
+        for path in (MODE_FILE, CONFIG_FILE):
+            if path not in watched and os.path.exists(path):
+                self.watcher.addPath(path)
+        
+        # Always watch the config directory, but /tmp only while the mode file is missing
+        directories = self.watcher.directories()
+        if CONFIG_DIR not in directories:
+            self.watcher.addPath(CONFIG_DIR)
+        mode_dir = os.path.dirname(MODE_FILE)
+        if os.path.exists(MODE_FILE):
+            if mode_dir in directories:
+                self.watcher.removePath(mode_dir)
+        elif mode_dir not in directories:
+            self.watcher.addPath(mode_dir)
+    
+    def directory_changed(self, path):
+        """Handle a file being created or removed next to a watched file"""
+        if path == CONFIG_DIR:
+            self.file_changed(CONFIG_FILE)
+        else:
+            self.update_icon()
+    
+    def file_changed(self, path):
+        """Handle a change to the mode or config file"""
+        # A deleted config is left alone until it is written again
+        if path == CONFIG_FILE and os.path.exists(CONFIG_FILE):
+            self.config = load_config()
+            self.rebuild_tooltip_cache()
+            self.sync_menu()
+        self.update_icon()
+    
+    def queue_notify(self, title, body):
+        """Queue a desktop notification, coalescing bursts into one"""
+        self._pending_notify.append((title, body))
+        self._notify_timer.start()
+    
+    def send_notifications(self):
+        """Show one notification for everything queued since the last one"""
+        pending, self._pending_notify = self._pending_notify, []
+        if not pending:
+            return
+        
+        # Only the latest message of each kind is still relevant
+        latest = {}
+        for title, body in pending:
+            latest.pop(title, None)
+            latest[title] = body
+        if len(latest) == 1:
+            title, body = next(iter(latest.items()))
+        else:
+            title = "Mouse Modes"
+            body = "\n".join(latest.values())
+        
+        _fire_and_forget(["notify-send", title, body, "-t", "2000"])
     
     def tray_activated(self, reason):
         """Handle tray icon activation"""
         if reason == QSystemTrayIcon.Trigger:  # Left click
-            switch_to_next_mode()
+            try:
+                mode_name = switch_to_next_mode(self.config)
+                self.queue_notify("Mouse Mode Switched", f"Now using: {mode_name} mode")
+                self.update_icon(current_mode=mode_name)
+            except Exception as e:
+                print(f"Error switching mode: {e}")
     
     def switch_to_mode(self, mode_name):
         """Switch to the specified mode"""
@@ -877,14 +1228,13 @@ class MouseModesTray:
             
             # Write the index to the mode file
             try:
-                with open(MODE_FILE, 'w') as f:
-                    f.write(str(index))
+                write_mode_index(index)
                 
                 # Show notification
-                subprocess.run(["notify-send", "Mouse Mode Switched", f"Now using: {mode_name} mode", "-t", "2000"])
+                self.queue_notify("Mouse Mode Switched", f"Now using: {mode_name} mode")
                 
-                # Update the icon
-                self.update_icon()
+                # Update the icon (no need to read back the file we just wrote)
+                self.update_icon(current_mode=mode_name)
             except Exception as e:
                 print(f"Error switching mode: {e}")
     
@@ -893,55 +1243,42 @@ class MouseModesTray:
         current_mode = get_current_mode_name(self.config)
         current_color = self.config["modes"][current_mode].get("color", "#3498db")
         
-        dialog = EnhancedColorDialog(current_color, None)
+        # Reuse the dialog after the first time it is opened
+        if self._color_dialog is None:
+            self._color_dialog = EnhancedColorDialog(current_color, None)
+        else:
+            self._color_dialog.reset(current_color)
+        dialog = self._color_dialog
         if dialog.exec_():
             color = dialog.get_selected_color()
             if color.isValid():
                 # Update the color in the configuration
+                self._icon_cache.pop(current_color, None)
                 self.config["modes"][current_mode]["color"] = color.name()
-                save_config(self.config)
+                save_config_in_background(self.config)
+                self.rebuild_tooltip_cache()
                 
                 # Show notification
-                subprocess.run(["notify-send", "Mode Color Changed",
-                               f"Color for {current_mode} mode updated to {color.name()}",
-                               "-t", "2000"])
+                self.queue_notify("Mode Color Changed",
+                                  f"Color for {current_mode} mode updated to {color.name()}")
                 
                 # Update the icon
                 self.update_icon()
     
     def open_config_dialog(self):
         """Open the configuration dialog"""
-        dialog = ConfigDialog(self.config, None)
+        # Reuse the dialog after the first time it is opened
+        if self._config_dialog is None:
+            self._config_dialog = ConfigDialog(self.config, None)
+        else:
+            self._config_dialog.reset(self.config)
+        dialog = self._config_dialog
         if dialog.exec_():
             # Reload configuration
             self.config = load_config()
+            self.rebuild_tooltip_cache()
             
-            # Recreate mode actions
-            self.menu.clear()
-            self.mode_actions = {}
-            
-            for mode_name in self.config["modes"]:
-                action = QAction(f"Switch to {mode_name} mode", self.menu)
-                action.triggered.connect(lambda checked, m=mode_name: self.switch_to_mode(m))
-                self.menu.addAction(action)
-                self.mode_actions[mode_name] = action
-            
-            self.menu.addSeparator()
-            
-            # Change color action for current mode
-            change_color_action = QAction("Change Current Mode Color...", self.menu)
-            change_color_action.triggered.connect(self.change_current_mode_color)
-            self.menu.addAction(change_color_action)
-            
-            # Configure action
-            configure_action = QAction("Configure...", self.menu)
-            configure_action.triggered.connect(self.open_config_dialog)
-            self.menu.addAction(configure_action)
-            
-            # Quit action
-            quit_action = QAction("Quit", self.menu)
-            quit_action.triggered.connect(self.app.quit)
-            self.menu.addAction(quit_action)
+            self.sync_menu()
             
             # Update the icon
             self.update_icon()
@@ -951,9 +1288,5 @@ class MouseModesTray:
         return self.app.exec_()
 
 if __name__ == "__main__":
-    # Fix for QSocketNotifier issue
-    import os
-    os.environ["QT_QPA_PLATFORM"] = "xcb"
-    
     tray = MouseModesTray()
     sys.exit(tray.run())
\ No newline at end of file